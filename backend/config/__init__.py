@@ -1 +1,9 @@
-from .config import PathConfigurations, PineconeConfigurations
\ No newline at end of file
+from .config import (
+    PathConfigurations,
+    PineconeConfigurations,
+    EmbeddingConfigurations,
+    ArtifactConfigurations,
+    ReRankerConfigurations,
+    LLMConfigurations,
+    ConversationConfigurations
+)
\ No newline at end of file
@@ -11,9 +11,53 @@ class PathConfigurations:
     MODEL_PATH = os.path.join(BASE_PATH, "model")
     LOG_DIR = os.path.join(BASE_PATH, "logs")
     DOCUMENTS_PATH = os.path.join(BASE_PATH, "documents")
+    ARTIFACTS_PATH = os.path.join(BASE_PATH, "artifacts")
 
 
 class PineconeConfigurations:
     PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY")
     PINECONE_API_ENV = os.environ.get("PINECONE_API_ENV")
     PINECONE_INDEX = os.environ.get("PINECONE_INDEX")
+
+
+class EmbeddingConfigurations:
+    EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+    EMBEDDING_DIMENSION = 384
+    CHUNK_SIZE = 500
+    CHUNK_OVERLAP = 20
+    # bump whenever the splitter changes so stale artifact bundles are rebuilt
+    CHUNKER_VERSION = f"recursive-{CHUNK_SIZE}-{CHUNK_OVERLAP}"
+
+
+class ArtifactConfigurations:
+    ARTIFACT_MAX_AGE_DAYS = float(os.environ.get("ARTIFACT_MAX_AGE_DAYS", 30))
+    ARTIFACT_MAX_SIZE_MB = float(os.environ.get("ARTIFACT_MAX_SIZE_MB", 1024))
+    ARTIFACT_STALE_WRITE_SECONDS = float(os.environ.get("ARTIFACT_STALE_WRITE_SECONDS", 60 * 60))
+    ARTIFACT_RESTORE_LIMIT = int(os.environ.get("ARTIFACT_RESTORE_LIMIT", 1))  # bundles reattached at startup
+
+
+class ReRankerConfigurations:
+    # opt-in: enabling it loads a second model (and torch) and retrieves RERANK_TOP_N candidates instead of 1
+    RERANK_ENABLED = os.environ.get("RERANK_ENABLED", "false").lower() == "true"
+    RERANK_MODEL = os.environ.get("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    RERANK_TOP_N = int(os.environ.get("RERANK_TOP_N", 8))      # dense candidates handed to the cross-encoder
+    RERANK_TOP_K = int(os.environ.get("RERANK_TOP_K", 1))      # documents kept for the prompt
+    RERANK_BATCH_SIZE = int(os.environ.get("RERANK_BATCH_SIZE", 16))
+    RERANK_TIME_BUDGET = float(os.environ.get("RERANK_TIME_BUDGET", 0.5))  # seconds
+    RERANK_CACHE_SIZE = int(os.environ.get("RERANK_CACHE_SIZE", 4096))
+    RERANK_PROBE_INTERVAL = int(os.environ.get("RERANK_PROBE_INTERVAL", 5))  # skips between single-pair probes
+
+
+class LLMConfigurations:
+    CONTEXT_LENGTH = 2048   # Llama-2 supports 4096; ctransformers defaults to 512 if unset
+    MAX_NEW_TOKENS = 512
+
+
+class ConversationConfigurations:
+    # upper bound only: the history also has to fit next to the template, context, question and answer
+    HISTORY_TOKEN_BUDGET = int(os.environ.get("HISTORY_TOKEN_BUDGET", 256))
+    # reuse a cached chunk when the follow-up is at least this fraction as similar to it as the question that
+    # retrieved it; relative, so it does not depend on the embedding model's absolute similarity range
+    REUSE_SIMILARITY_RATIO = float(os.environ.get("REUSE_SIMILARITY_RATIO", 0.9))
+    REUSE_WINDOW = int(os.environ.get("REUSE_WINDOW", 3))  # recent retrievals whose chunks are kept for reuse
+    RETRIEVAL_K = 1
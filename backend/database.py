@@ -3,7 +3,7 @@ from pinecone import Pinecone, ServerlessSpec, PodSpec
 from langchain_pinecone import PineconeVectorStore
 from pinecone.core.client.exceptions import NotFoundException, UnauthorizedException
 import time
-from config import PineconeConfigurations
+from config import PineconeConfigurations, EmbeddingConfigurations
 from logger import Logger
 
 
@@ -38,11 +38,14 @@ class ChatbotDB:
         self.logger = Logger(name="PineconeDB")
     
     # Initialize the Pinecone
-    def connect(self):
+    def connect(self, clear=True):
         """
         Establishes a connection with Pinecone, checks for an existing index, deletes the index if it exists, 
         creates a new index if needed, initializes the index, and handles exceptions for connection and deletion.
 
+        Parameters:
+            clear (bool, optional): Delete the existing data in the index. Defaults to True.
+
         Returns:
             None
         """
@@ -61,7 +64,7 @@ class ChatbotDB:
             vector_status = index.describe_index_stats()
             vector_count = vector_status["total_vector_count"]
 
-            if vector_count > 0:
+            if clear and vector_count > 0:
                 try:
                     index.delete(deleteAll=True)
                     self.logger.info(msg="Deleted existing data in the index.")
@@ -74,7 +77,7 @@ class ChatbotDB:
             # create a new index
             self.client.create_index(
                 name=self.index,
-                dimension=384,  # dimensionality of all-MiniLM-L6-v2
+                dimension=EmbeddingConfigurations.EMBEDDING_DIMENSION,
                 spec=spec
             )
 
@@ -92,26 +95,88 @@ class ChatbotDB:
         except UnauthorizedException:
             self.logger.error(msg="Unauthorized connection, kindly provide valid API KEY and API ENV.")
     
-    # Store embeddings of the document in the vector DB
-    def insert_embeddings(self, text_chunks, embedding):
+    # Store precomputed vectors in the vector DB
+    def insert_vectors(self, ids, text_chunks, vectors, batch_size=100):
         """
-        Inserts embeddings of text chunks into the Pinecone vector store.
+        Upserts precomputed vectors into the Pinecone index, using the same "text" metadata key
+        as PineconeVectorStore so they can be retrieved with get_embeddings.
 
         Parameters:
-            text_chunks (List[TextChunk]): A list of TextChunk objects representing the text chunks to be inserted.
-            embedding (Embedding): The embedding to be used for the text chunks.
+            ids (List[str]): One stable id per vector, so repeated upserts overwrite instead of duplicating.
+            text_chunks (List[TextChunk]): The text chunks the vectors were computed from.
+            vectors (Sequence): One embedding per text chunk.
+            batch_size (int, optional): Number of vectors sent per request. Defaults to 100.
 
         Returns:
-            bool: True if the embeddings were successfully inserted, False otherwise.
+            bool: True if the vectors were successfully inserted, False otherwise.
         """
         try:
-            PineconeVectorStore.from_texts(texts=[t.page_content for t in text_chunks], index_name=self.index, embedding=embedding)
+            index = self.client.Index(self.index)
+            for start in range(0, len(ids), batch_size):
+                end = start + batch_size
+                index.upsert(vectors=[
+                    {"id": i, "values": [float(v) for v in vector], "metadata": {"text": chunk.page_content}}
+                    for i, chunk, vector in zip(ids[start:end], text_chunks[start:end], vectors[start:end])
+                ])
             return True
 
         except Exception as e:
-            self.logger.error(msg=f"Error while inserting embeddings: {str(e)}")
+            self.logger.error(msg=f"Error while inserting vectors: {str(e)}")
             return False
 
+    # Find which vectors the index does not hold yet
+    def missing_ids(self, ids, batch_size=100):
+        """
+        Checks which of the given ids are not stored in the Pinecone index.
+
+        Parameters:
+            ids (List[str]): The vector ids to look up.
+            batch_size (int, optional): Number of ids fetched per request. Defaults to 100.
+
+        Returns:
+            List[str]: The ids that are not in the index, in their original order.
+        """
+        index = self.client.Index(self.index)
+        stored = set()
+        for start in range(0, len(ids), batch_size):
+            stored.update(index.fetch(ids=ids[start:start + batch_size]).vectors.keys())
+        return [i for i in ids if i not in stored]
+
+    # Reattach persisted artifact bundles without recomputing their embeddings
+    def attach_bundles(self, bundles):
+        """
+        Inserts the vectors of the given artifact bundles into the Pinecone index, skipping
+        vectors the index still holds (e.g. after a pod restart).
+
+        Parameters:
+            bundles (list): Bundles returned by ArtifactStore.load or ArtifactStore.load_recent.
+
+        Returns:
+            bool: True if every bundle was attached, False otherwise.
+        """
+        attached = True
+        for bundle in bundles:
+            doc_id = bundle["manifest"]["doc_id"]
+            ids = [f"{doc_id}-{i}" for i in range(len(bundle["chunks"]))]
+            try:
+                missing = set(self.missing_ids(ids=ids))
+
+            except Exception as e:
+                self.logger.error(msg=f"Error while fetching vectors: {str(e)}")
+                attached = False
+                continue
+
+            positions = [i for i, vector_id in enumerate(ids) if vector_id in missing]
+            if positions:
+                attached = self.insert_vectors(
+                    ids=[ids[i] for i in positions],
+                    text_chunks=[bundle["chunks"][i] for i in positions],
+                    vectors=[bundle["vectors"][i] for i in positions]) and attached
+
+            self.logger.info(msg=f"Attached bundle {doc_id}: {len(positions)} of {len(ids)} vectors upserted.")
+
+        return attached
+
     # Fetch embeddings of the most similar texts with query from vector DB
     def get_embeddings(self, embedding):
         """
@@ -1,15 +1,50 @@
 import streamlit as st
 from src.helper import HelperFunctions
 from src.document_loader import DocumentHandler
+from src.reranker import ReRanker
+from src.artifacts import ArtifactStore
+from src.conversation import ChatSession
+from config import ReRankerConfigurations
 from database import ChatbotDB
 from logger import Logger
 
 
 helper = HelperFunctions()
 document = DocumentHandler()
+artifacts = ArtifactStore()
 logger = Logger("API")
 
 
+# Cached per process, not per browser session: refreshes and new visitors must not touch the index again
+@st.cache_resource(show_spinner="Restoring documents...")
+def restore_documents(_db):
+    """
+    Reattaches the most recent persisted artifact bundles to the vector store once per process,
+    without clearing the index and upserting only vectors it no longer holds.
+
+    Parameters:
+        _db (ChatbotDB): The database to attach the bundles to (not hashed by Streamlit).
+
+    Returns:
+        list: The names of the restored documents.
+
+    Raises:
+        RuntimeError: If the bundles could not be attached; Streamlit does not cache it, so a later session retries.
+    """
+    artifacts.garbage_collect()
+    bundles = artifacts.load_recent()
+    if not bundles:
+        return []
+
+    _db.connect(clear=False)
+    if not _db.attach_bundles(bundles=bundles):
+        raise RuntimeError("Artifact bundles could not be attached.")
+
+    restored = [b["manifest"]["source_name"] for b in bundles]
+    logger.info(msg=f"Restored documents: {restored}")
+    return restored
+
+
 def main():
     """
     A function to execute the main logic of the program, which involves loading embeddings, 
@@ -41,6 +76,26 @@ def main():
     # Initialise database
     db = ChatbotDB()
 
+    # Keep the re-ranker (and its score cache) alive across Streamlit reruns
+    if "reranker" not in st.session_state:
+        st.session_state.reranker = ReRanker() if ReRankerConfigurations.RERANK_ENABLED else None
+
+    # Conversation memory for chat mode
+    if "chat" not in st.session_state:
+        st.session_state.chat = ChatSession()
+
+    # Reattach persisted artifact bundles instead of asking for a re-upload
+    if "restored" not in st.session_state:
+        try:
+            st.session_state.restored = list(restore_documents(db))
+
+        except Exception as e:
+            logger.error(msg=f"Error while restoring documents: {str(e)}")
+            st.session_state.restored = []
+
+    if st.session_state.restored:
+        st.info(f"Restored previously uploaded documents: {', '.join(st.session_state.restored)}")
+
     # Request file from user
     uploaded_file = st.file_uploader("Choose a file", type=("txt", "doc", "pdf", "csv"))
 
@@ -52,20 +107,60 @@ def main():
         logger.info(msg="File received!")
         with st.spinner('Preparing document...'):
             while not vectors_stored:
-                file_path = document.save(file=uploaded_file)
+                # Stream the upload to disk, hashing it on the way
+                file_path, doc_id = document.save(file=uploaded_file)
 
-                # Load the document according to its format
-                documents = document.load(file_path=file_path)
+                if file_path is None:
+                    msg = "INTERNAL SERVER ERROR. Kindly upload the document again!"
+                    logger.error(msg=msg)
+                    st.error(msg)
+                    break
 
                 # Establishing connection and creating index in pinecone
                 db.connect()
 
-                # Create chunks from the document
-                text_chunks = helper.split_text(documents=documents)
+                # Reuse the artifact bundle of an already ingested document
+                bundle = artifacts.load(doc_id=doc_id)
+                if bundle is not None:
+                    logger.info(msg="Reusing stored artifacts for the document!")
+                    vectors_stored = db.attach_bundles(bundles=[bundle])
+
+                else:
+                    # Load the document according to its format
+                    documents = document.load(file_path=file_path)
+
+                    # Create chunks from the document
+                    text_chunks = helper.split_text(documents=documents)
+
+                    # Embed the chunks once so the vectors can be stored and persisted
+                    vectors = None
+                    if isinstance(text_chunks, list):
+                        vectors = helper.embed_chunks(text_chunks=text_chunks, embedding=embedding)
+
+                    # Loading, chunking and embedding log and swallow their errors
+                    if not isinstance(documents, list) or vectors is None or len(vectors) != len(text_chunks):
+                        vectors_stored = False
+
+                    else:
+                        # Store embeddings of the document in the vector DB
+                        ids = [f"{doc_id}-{i}" for i in range(len(text_chunks))]
+                        vectors_stored = db.insert_vectors(ids=ids, text_chunks=text_chunks, vectors=vectors)
+
+                    if vectors_stored:
+                        artifacts.save(
+                            doc_id=doc_id,
+                            source_name=uploaded_file.name,
+                            documents=documents,
+                            text_chunks=text_chunks,
+                            vectors=vectors)
+                        artifacts.garbage_collect(keep=doc_id)
 
-                # Store embeddings of the document in the vector DB
-                vectors_stored = db.insert_embeddings(text_chunks=text_chunks, embedding=embedding)
                 st.session_state.file = False if vectors_stored else True
+                st.session_state.restored = []
+
+                # A new document starts a new conversation
+                if vectors_stored:
+                    st.session_state.chat = ChatSession()
 
                 if not vectors_stored:
                     msg = "INTERNAL SERVER ERROR. Kindly upload the document again!"
@@ -73,11 +168,27 @@ def main():
                     st.error(msg)
                 break
                 
+    has_document = bool(uploaded_file or st.session_state.restored)
+
+    # Chat mode keeps a rolling history and reuses retrievals across follow-up questions
+    chat_mode = st.toggle("Chat mode", value=False, disabled=not has_document)
+    chat = st.session_state.chat
+
     # query from user
-    query = st.text_input(
-        "Ask your question",
-        placeholder="Can you give me a brief summary?",
-        disabled=not uploaded_file)
+    if chat_mode:
+        for turn in chat.turns:
+            with st.chat_message("user"):
+                st.write(turn["query"])
+            with st.chat_message("assistant"):
+                st.write(turn["answer"])
+
+        query = st.chat_input("Ask your question", disabled=not has_document)
+
+    else:
+        query = st.text_input(
+            "Ask your question",
+            placeholder="Can you give me a brief summary?",
+            disabled=not has_document)
 
     # Generate response for the user's query
     if query:
@@ -95,19 +206,52 @@ def main():
                     logger.error(msg=msg)
                     st.error(msg)
 
-                # Prepare the user's prompt
-                prompt = helper.prepare_prompt()
+                if chat_mode:
+                    # Reuse recent chunks for close follow-ups, query the vector DB otherwise
+                    chunks, retrieval_calls = chat.retrieve(
+                        query=query,
+                        embedding=embedding,
+                        vector_store=vector_store,
+                        reranker=st.session_state.reranker)
 
-                # Initialise qa chain
-                qa = helper.qa_chain(prompt=prompt, 
-                    llm=llm,
-                    vector_store=vector_store)
+                    # Prepare the user's prompt with the rolling history
+                    prompt = helper.prepare_chat_prompt()
 
-                # return search result
-                result = helper.search_result(qa=qa, query=query)
-                st.write(result["result"])
-                break
+                    result = helper.chat_result(prompt=prompt,
+                        llm=llm,
+                        chunks=chunks,
+                        history=chat.history(budget=chat.history_budget(query=query, chunks=chunks)),
+                        query=query)
+                    answer = result["output_text"]
+
+                    chat.add_turn(query=query,
+                        answer=answer,
+                        retrieval_calls=retrieval_calls)
+
+                    with st.chat_message("user"):
+                        st.write(query)
+                    with st.chat_message("assistant"):
+                        st.write(answer)
+
+                    logger.info(msg=f"Chat session stats: {chat.stats()}")
 
+                else:
+                    # Prepare the user's prompt
+                    prompt = helper.prepare_prompt()
+
+                    # Initialise qa chain
+                    qa = helper.qa_chain(prompt=prompt, 
+                        llm=llm,
+                        vector_store=vector_store,
+                        reranker=st.session_state.reranker)
+
+                    # return search result
+                    result = helper.search_result(qa=qa, query=query)
+                    st.write(result["result"])
+
+                if st.session_state.reranker is not None:
+                    logger.info(msg=f"Re-ranker stats: {st.session_state.reranker.stats()}")
+                break
 
 if __name__ == "__main__":
     try:
@@ -1,3 +1,6 @@
 from . import helper
 from . import document_loader
-from . import prompt
\ No newline at end of file
+from . import prompt
+from . import reranker
+from . import artifacts
+from . import conversation
\ No newline at end of file
@@ -0,0 +1,254 @@
+import numpy as np
+from langchain_core.documents import Document
+from datetime import datetime
+import json
+import os
+import shutil
+import tempfile
+import time
+from logger.logger import Logger
+from config import PathConfigurations, EmbeddingConfigurations, ArtifactConfigurations
+
+
+BUNDLE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+TMP_SUFFIX = ".tmp"
+TEXT_FILE = "text.json"
+CHUNKS_FILE = "chunks.json"
+VECTORS_FILE = "vectors.npy"
+
+
+class ArtifactStore:
+    def __init__(
+            self,
+            artifact_path=PathConfigurations.ARTIFACTS_PATH,
+            max_age_days=ArtifactConfigurations.ARTIFACT_MAX_AGE_DAYS,
+            max_size_mb=ArtifactConfigurations.ARTIFACT_MAX_SIZE_MB,
+            stale_write_seconds=ArtifactConfigurations.ARTIFACT_STALE_WRITE_SECONDS
+            ) -> None:
+        """
+        Initializes the ArtifactStore which keeps the parsed text, chunks and vectors of every ingested
+        document on disk so that they can be reattached after a restart without recomputation.
+
+        Args:
+            artifact_path (str, optional): Directory holding one bundle per document. Defaults to PathConfigurations.ARTIFACTS_PATH.
+            max_age_days (float, optional): Bundles older than this are garbage-collected.
+            max_size_mb (float, optional): Oldest bundles are garbage-collected once the total size exceeds this.
+            stale_write_seconds (float, optional): Age after which an unfinished bundle write is treated as abandoned.
+
+        Returns:
+            None
+        """
+        self.logger = Logger("ArtifactStore")
+        self.artifact_path = artifact_path
+        self.max_age_days = max_age_days
+        self.max_size_mb = max_size_mb
+        self.stale_write_seconds = stale_write_seconds
+
+    def bundle_path(self, doc_id):
+        return os.path.join(self.artifact_path, doc_id)
+
+    @staticmethod
+    def _serialize(documents):
+        return [{"page_content": d.page_content, "metadata": d.metadata} for d in documents]
+
+    # Persist everything derived from a document
+    def save(self, doc_id, source_name, documents, text_chunks, vectors):
+        """
+        Writes the artifact bundle of a document: parsed text, chunks, vectors and a manifest.
+        The bundle is written to a private temporary directory first and moved into place atomically,
+        so concurrent sessions never see or overwrite a half-written bundle.
+
+        Parameters:
+            doc_id (str): The content hash of the document.
+            source_name (str): The original name of the uploaded file.
+            documents (list): The parsed documents returned by the loader.
+            text_chunks (list): The chunks created from the documents.
+            vectors (list): One embedding per chunk.
+
+        Returns:
+            str or None: The bundle directory if saved, None otherwise.
+        """
+        tmp_path = None
+        try:
+            os.makedirs(self.artifact_path, exist_ok=True)
+            bundle_path = self.bundle_path(doc_id)
+            tmp_path = tempfile.mkdtemp(dir=self.artifact_path, prefix=doc_id + ".", suffix=TMP_SUFFIX)
+
+            vectors = np.asarray(vectors, dtype=np.float32)
+            np.save(os.path.join(tmp_path, VECTORS_FILE), vectors)
+
+            with open(os.path.join(tmp_path, TEXT_FILE), "w", encoding="utf-8") as buffer:
+                json.dump(self._serialize(documents), buffer, default=str)
+
+            with open(os.path.join(tmp_path, CHUNKS_FILE), "w", encoding="utf-8") as buffer:
+                json.dump(self._serialize(text_chunks), buffer, default=str)
+
+            manifest = {
+                "bundle_version": BUNDLE_VERSION,
+                "doc_id": doc_id,
+                "source_name": source_name,
+                "created_at": datetime.now().isoformat(),
+                "embedding_model": EmbeddingConfigurations.EMBEDDING_MODEL,
+                "embedding_dimension": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+                "chunker_version": EmbeddingConfigurations.CHUNKER_VERSION,
+                "num_chunks": len(text_chunks),
+            }
+            # manifest is written last: a bundle without one is incomplete
+            with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as buffer:
+                json.dump(manifest, buffer, indent=2)
+
+            shutil.rmtree(bundle_path, ignore_errors=True)
+            os.replace(tmp_path, bundle_path)
+
+            self.logger.info(msg=f"Artifact bundle saved for {source_name}!")
+            return bundle_path
+
+        except Exception as e:
+            self.logger.error(msg=f"Error while saving artifact bundle: {str(e)}")
+            if tmp_path is not None:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def _read_manifest(self, bundle_path):
+        with open(os.path.join(bundle_path, MANIFEST_FILE), encoding="utf-8") as buffer:
+            return json.load(buffer)
+
+    def _is_compatible(self, manifest):
+        return manifest.get("bundle_version") == BUNDLE_VERSION and \
+            manifest.get("embedding_model") == EmbeddingConfigurations.EMBEDDING_MODEL and \
+            manifest.get("chunker_version") == EmbeddingConfigurations.CHUNKER_VERSION
+
+    # Reload a bundle without re-parsing, re-chunking or re-embedding
+    def load(self, doc_id):
+        """
+        Loads the artifact bundle of a document if it exists and was built with the current
+        embedding model and chunker.
+
+        Parameters:
+            doc_id (str): The content hash of the document.
+
+        Returns:
+            dict or None: The bundle with "manifest", "chunks" (list of Document) and "vectors" (numpy array),
+                          or None if no usable bundle exists.
+        """
+        bundle_path = self.bundle_path(doc_id)
+        if not os.path.exists(os.path.join(bundle_path, MANIFEST_FILE)):
+            return None
+
+        try:
+            manifest = self._read_manifest(bundle_path)
+            if not self._is_compatible(manifest):
+                self.logger.info(msg=f"Artifact bundle {doc_id} is stale, ignoring it.")
+                return None
+
+            with open(os.path.join(bundle_path, CHUNKS_FILE), encoding="utf-8") as buffer:
+                chunks = [Document(**c) for c in json.load(buffer)]
+
+            # memory-map the vectors: they are only read to be sent to the vector store
+            vectors = np.load(os.path.join(bundle_path, VECTORS_FILE), mmap_mode="r")
+
+            if len(chunks) != len(vectors):
+                self.logger.error(msg=f"Artifact bundle {doc_id} is corrupted, ignoring it.")
+                return None
+
+            # touch the manifest so recently used bundles survive garbage collection
+            os.utime(os.path.join(bundle_path, MANIFEST_FILE))
+            return {"manifest": manifest, "chunks": chunks, "vectors": vectors}
+
+        except Exception as e:
+            self.logger.error(msg=f"Error while loading artifact bundle: {str(e)}")
+
+    def _bundles(self):
+        """
+        Lists complete bundles as (last used time, size in bytes, path), most recently used first.
+        """
+        if not os.path.isdir(self.artifact_path):
+            return []
+
+        bundles = []
+        for name in os.listdir(self.artifact_path):
+            path = os.path.join(self.artifact_path, name)
+            manifest = os.path.join(path, MANIFEST_FILE)
+            if name.endswith(TMP_SUFFIX) or not os.path.isfile(manifest):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            bundles.append((os.path.getmtime(manifest), size, path))
+
+        return sorted(bundles, reverse=True)
+
+    # Reload the most recently used bundles in bulk
+    def load_recent(self, limit=ArtifactConfigurations.ARTIFACT_RESTORE_LIMIT):
+        """
+        Loads up to `limit` of the most recently used bundles.
+
+        Parameters:
+            limit (int, optional): Maximum number of bundles to load. Defaults to ArtifactConfigurations.ARTIFACT_RESTORE_LIMIT.
+
+        Returns:
+            list: The loaded bundles, most recently used first.
+        """
+        bundles = []
+        for _, _, path in self._bundles():
+            if len(bundles) >= limit:
+                break
+            bundle = self.load(doc_id=os.path.basename(path))
+            if bundle is not None:
+                bundles.append(bundle)
+        return bundles
+
+    # Remove bundles that are too old or that push the store over its size limit
+    def garbage_collect(self, keep=None):
+        """
+        Deletes abandoned partial writes, bundles older than max_age_days and, oldest first,
+        bundles beyond max_size_mb.
+
+        Parameters:
+            keep (str, optional): The id of a bundle that must not be deleted, such as the one just saved.
+                                  Its size still counts towards max_size_mb.
+
+        Returns:
+            int: The number of bundles deleted.
+        """
+        if not os.path.isdir(self.artifact_path):
+            return 0
+
+        deleted = 0
+        try:
+            now = time.time()
+
+            # leftovers of interrupted writes; recent ones may still be written by another session
+            for name in os.listdir(self.artifact_path):
+                path = os.path.join(self.artifact_path, name)
+                unfinished = name.endswith(TMP_SUFFIX) or not os.path.isfile(os.path.join(path, MANIFEST_FILE))
+                if os.path.isdir(path) and unfinished and now - os.path.getmtime(path) > self.stale_write_seconds:
+                    shutil.rmtree(path, ignore_errors=True)
+                    deleted += 1
+
+            oldest_allowed = now - self.max_age_days * 24 * 60 * 60
+            size_budget = self.max_size_mb * 1024 * 1024
+            bundles = self._bundles()
+            total_size = 0
+
+            for _, size, path in bundles:
+                if os.path.basename(path) == keep:
+                    total_size += size
+                    if size > size_budget:
+                        self.logger.warning(
+                            msg=f"Artifact bundle {keep} alone exceeds {self.max_size_mb} MB, keeping it anyway.")
+
+            for last_used, size, path in bundles:
+                if os.path.basename(path) == keep:
+                    continue
+                if last_used < oldest_allowed or total_size + size > size_budget:
+                    shutil.rmtree(path, ignore_errors=True)
+                    deleted += 1
+                else:
+                    total_size += size
+
+            if deleted:
+                self.logger.info(msg=f"Garbage-collected {deleted} artifact bundles.")
+            return deleted
+
+        except Exception as e:
+            self.logger.error(msg=f"Error while garbage-collecting artifact bundles: {str(e)}")
+            return deleted
@@ -0,0 +1,187 @@
+import numpy as np
+from collections import deque
+from logger.logger import Logger
+from src.prompt import chat_prompt_template
+from config import ConversationConfigurations, ReRankerConfigurations, LLMConfigurations
+
+
+class ChatSession:
+    def __init__(
+            self,
+            token_budget=ConversationConfigurations.HISTORY_TOKEN_BUDGET,
+            reuse_ratio=ConversationConfigurations.REUSE_SIMILARITY_RATIO,
+            reuse_window=ConversationConfigurations.REUSE_WINDOW,
+            context_length=LLMConfigurations.CONTEXT_LENGTH,
+            max_new_tokens=LLMConfigurations.MAX_NEW_TOKENS
+            ) -> None:
+        """
+        Initializes a chat session which keeps a rolling history of turns and reuses the chunks
+        retrieved for recent turns when a follow-up question's embedding is close to them.
+
+        Args:
+            token_budget (int, optional): Upper bound on the tokens the history may add to a prompt.
+            reuse_ratio (float, optional): A cached chunk is reused when the follow-up's similarity to it reaches
+                                           this fraction of the similarity of the question that retrieved it.
+            reuse_window (int, optional): Number of recent retrievals whose chunks are kept for reuse.
+            context_length (int, optional): The LLM's context window in tokens.
+            max_new_tokens (int, optional): Tokens reserved for the generated answer.
+
+        Returns:
+            None
+        """
+        self.logger = Logger("ChatSession")
+        self.token_budget = token_budget
+        self.reuse_ratio = reuse_ratio
+        self.reuse_window = reuse_window
+        self.context_length = context_length
+        self.max_new_tokens = max_new_tokens
+
+        # each turn keeps only its text: query, answer and retrieval calls made
+        self.turns = []
+        # reuse candidates of the most recent retrievals: chunks, their vectors and their similarity
+        # to the question that retrieved them
+        self.candidates = deque(maxlen=reuse_window)
+        self.retrieval_calls = 0
+        self.reused = 0
+
+    @staticmethod
+    def count_tokens(text):
+        # deliberately pessimistic estimate (~3 characters per token, Llama averages closer to 4)
+        # that avoids loading the LLM tokenizer
+        return len(text) // 3 + 1
+
+    @staticmethod
+    def _cosine(a, b):
+        norm = np.linalg.norm(a) * np.linalg.norm(b)
+        return float(np.dot(a, b) / norm) if norm else 0.0
+
+    # Find the recent retrieval whose chunks are closest to the follow-up
+    def _closest_candidate(self, query_vector):
+        best, best_score = None, 0.0
+        for candidate in self.candidates:
+            # how relevant the chunks are to the follow-up, relative to the question that retrieved them
+            score = max(self._cosine(query_vector, vector) / anchor if anchor > 0 else 0.0
+                        for vector, anchor in zip(candidate["vectors"], candidate["anchors"]))
+            if score > best_score:
+                best, best_score = candidate, score
+        return best, best_score
+
+    # Retrieve context for a question, reusing recent chunks when possible
+    def retrieve(self, query, embedding, vector_store, reranker=None):
+        """
+        Returns the chunks to answer the query with. If the query's embedding is close enough to the chunks
+        of a recent retrieval, those chunks are reused and the vector store is not queried.
+
+        Parameters:
+            query (str): The user's question.
+            embedding (HuggingFaceEmbeddings): The embedding model.
+            vector_store (PineconeVectorStore): The vector store to query on a miss.
+            reranker (ReRanker, optional): Re-orders the top-N dense hits. Defaults to None.
+
+        Returns:
+            tuple: The chunks to use and the number of vector-store calls made.
+        """
+        query_vector = np.asarray(embedding.embed_query(query), dtype=np.float32)
+
+        candidate, score = self._closest_candidate(query_vector)
+        if candidate is not None and score >= self.reuse_ratio:
+            self.reused += 1
+            self.logger.info(msg=f"Reusing chunks of a previous turn (relative similarity {score:.2f}).")
+            return candidate["chunks"], 0
+
+        k = ReRankerConfigurations.RERANK_TOP_N if reranker is not None else ConversationConfigurations.RETRIEVAL_K
+        # search by the vector we already have instead of embedding the query again
+        results = vector_store.similarity_search_by_vector_with_score(embedding=query_vector.tolist(), k=k)
+        chunks = [doc for doc, _ in results]
+        self.retrieval_calls += 1
+
+        if reranker is not None:
+            chunks = reranker.rerank(query=query, documents=chunks)[:ReRankerConfigurations.RERANK_TOP_K]
+
+        # an empty retrieval is no context worth reusing
+        if chunks:
+            # embedded locally: no extra vector-store round trip
+            vectors = np.asarray(embedding.embed_documents([c.page_content for c in chunks]), dtype=np.float32)
+            self.candidates.append({
+                "chunks": chunks,
+                "vectors": vectors,
+                "anchors": [self._cosine(query_vector, vector) for vector in vectors],
+            })
+
+        return chunks, 1
+
+    # Work out how much of the context window is left for history
+    def history_budget(self, query, chunks):
+        """
+        Computes the tokens available for history once the template, the retrieved chunks, the question
+        and the answer are accounted for, capped at token_budget.
+
+        Parameters:
+            query (str): The user's question.
+            chunks (list): The chunks that will be stuffed into the prompt.
+
+        Returns:
+            int: The number of tokens the history may use.
+        """
+        reserved = self.count_tokens(chat_prompt_template) + self.count_tokens(query) + \
+            sum(self.count_tokens(chunk.page_content) for chunk in chunks) + self.max_new_tokens
+        return max(0, min(self.token_budget, self.context_length - reserved))
+
+    # Render the rolling history within the token budget
+    def history(self, budget=None):
+        """
+        Renders previous turns for the prompt, newest first in priority. Recent turns are kept verbatim;
+        once the budget is tight older turns are reduced to their question, and the oldest are dropped.
+
+        Parameters:
+            budget (int, optional): Tokens the history may use, see history_budget. Defaults to token_budget.
+
+        Returns:
+            str: The conversation history, oldest turn first.
+        """
+        lines = []
+        budget = self.token_budget if budget is None else budget
+        for turn in reversed(self.turns):
+            full = f"User: {turn['query']}\nAssistant: {turn['answer']}"
+            short = f"User: {turn['query']}"
+            if self.count_tokens(full) <= budget:
+                lines.append(full)
+                budget -= self.count_tokens(full)
+            elif self.count_tokens(short) <= budget:
+                lines.append(short)
+                budget -= self.count_tokens(short)
+            else:
+                break
+
+        return "\n".join(reversed(lines))
+
+    def add_turn(self, query, answer, retrieval_calls):
+        """
+        Records a completed turn. Only its text is kept; chunks and vectors live in the bounded candidates.
+
+        Parameters:
+            query (str): The user's question.
+            answer (str): The generated answer.
+            retrieval_calls (int): Vector-store calls made for this turn.
+        """
+        self.turns.append({
+            "query": query,
+            "answer": answer,
+            "retrieval_calls": retrieval_calls,
+        })
+
+    def stats(self):
+        """
+        Reports how many vector-store round trips the session made and how often chunks were reused.
+
+        Returns:
+            dict: Turn, retrieval-call and reuse counts and the retrieval calls per turn.
+        """
+        turns = len(self.turns)
+        return {
+            "turns": turns,
+            "retrieval_calls": self.retrieval_calls,
+            "reused": self.reused,
+            "retrieval_calls_per_turn": self.retrieval_calls / turns if turns else 0.0,
+            "history_tokens": self.count_tokens(self.history()) if turns else 0,
+        }
@@ -2,6 +2,7 @@ from langchain_community.document_loaders.text import TextLoader
 from langchain_community.document_loaders.word_document import Docx2txtLoader
 from langchain_community.document_loaders.pdf import PyMuPDFLoader
 from langchain_community.document_loaders.csv_loader import  CSVLoader
+from hashlib import sha256
 import os
 from datetime import datetime
 from logger.logger import Logger
@@ -19,6 +20,7 @@ class DocumentHandler:
         self.base_path = PathConfigurations.BASE_PATH,
         self.model_path = PathConfigurations.MODEL_PATH
         self.document_path = PathConfigurations.DOCUMENTS_PATH
+        self.write_chunk_size = 1024 * 1024  # bytes written per step while saving uploads
 
     # To load text documents
     def text_loader(self, file_path):
@@ -89,37 +91,67 @@ class DocumentHandler:
         self.logger.info(msg="CSV file loaded!")
         return documents
 
+    # Stream an upload to disk through a fixed-size buffer
+    def _write_stream(self, file, buffer, digest):
+        """
+        Writes a file-like object to an open buffer in fixed-size chunks, hashing every chunk as it is written.
+
+        The upload is read with readinto() into a single reusable chunk, so at most one chunk is held in
+        addition to the upload itself. (BytesIO.getbuffer() is avoided on purpose: it unshares the
+        buffer of a BytesIO created from bytes, such as Streamlit's UploadedFile, and copies the whole upload.)
+
+        Parameters:
+            file (file-like object): The upload to write.
+            buffer (file object): The destination opened in binary mode.
+            digest (hashlib hash): Updated with every chunk written.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        written = 0
+        file.seek(0)
+        chunk = bytearray(self.write_chunk_size)
+        view = memoryview(chunk)
+        while True:
+            size = file.readinto(chunk)
+            if not size:
+                break
+            digest.update(view[:size])
+            written += buffer.write(view[:size])
+        return written
+
     # To save documents
     def save(self, file):
         """
-        Save the given file to the document path.
+        Save the given file to the document path, streaming it in fixed-size chunks
+        and hashing its content during the write.
 
         Parameters:
             file (file-like object): The file to be saved.
 
         Returns:
-            str: The file path where the file is saved.
+            tuple: The file path where the file is saved and the SHA-256 hex digest of its content.
 
         Raises:
             Exception: If there is an error while saving the document.
         """
         try:
             os.makedirs(self.document_path, exist_ok=True)
-            filename, ext = file.name.split(".")
+            filename, ext = os.path.splitext(os.path.basename(file.name))
 
-            filename = filename + "-" + datetime.strftime(datetime.now(), format="%d-%m-%Y-%H-%M-%S") + "." + ext
+            filename = filename + "-" + datetime.strftime(datetime.now(), format="%d-%m-%Y-%H-%M-%S") + ext
             file_path = os.path.join(self.document_path, filename)
 
-            # To read file as bytes:
-            bytes_data = file.getvalue()
+            digest = sha256()
             with open(file_path, "wb") as buffer:
-                buffer.write(bytes_data)
+                size = self._write_stream(file=file, buffer=buffer, digest=digest)
 
-            self.logger.info(msg="Document saved!")
-            return file_path
+            self.logger.info(msg=f"Document saved! ({size} bytes)")
+            return file_path, digest.hexdigest()
         
         except Exception as e:
             self.logger.error(msg=f"Error while saving document: {str(e)}")
+            return None, None
 
     # To load documents
     def load(self, file_path):
@@ -133,7 +165,7 @@ class DocumentHandler:
             The loaded documents based on the file extension or an error message if the file type is not supported.
         """
         try:
-            ext = file_path.split(".")[-1]
+            ext = os.path.splitext(file_path)[1].lstrip(".").lower()
             if ext == "txt":
                 documents = self.text_loader(file_path=file_path)
             elif ext == "doc":
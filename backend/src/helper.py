@@ -2,12 +2,15 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.embeddings.huggingface import HuggingFaceEmbeddings
 from langchain_community.llms.ctransformers import CTransformers
 from langchain.chains.retrieval_qa.base import RetrievalQA
+from langchain.chains.question_answering import load_qa_chain
+from langchain.retrievers import ContextualCompressionRetriever
 from langchain.prompts import PromptTemplate
 from huggingface_hub import hf_hub_download
 from logger.logger import Logger
 import os
-from src.prompt import prompt_template
-from config import PathConfigurations
+from src.prompt import prompt_template, chat_prompt_template
+from src.reranker import CrossEncoderCompressor
+from config import PathConfigurations, EmbeddingConfigurations, ReRankerConfigurations, LLMConfigurations
 
 
 class HelperFunctions:
@@ -37,7 +40,9 @@ class HelperFunctions:
         """
         try:
             self.logger.info("Tokenization in progress...")
-            text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=20)
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=EmbeddingConfigurations.CHUNK_SIZE,
+                chunk_overlap=EmbeddingConfigurations.CHUNK_OVERLAP)
             docs = text_splitter.split_documents(documents=documents)
             self.logger.info("Tokenization completed!")
             return docs
@@ -59,13 +64,37 @@ class HelperFunctions:
         """
         try:
             self.logger.info("Downloading Embeddings from HuggingfaceHub...")
-            embedding = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+            embedding = HuggingFaceEmbeddings(model_name=EmbeddingConfigurations.EMBEDDING_MODEL)
             self.logger.info("Embeddings Downloaded!")
             return embedding
         
         except Exception as e:
             self.logger.error(msg=f"Error while downloading embeddings: {str(e)}")
 
+    # Embed text chunks so the vectors can be stored and reused
+    def embed_chunks(self, text_chunks, embedding):
+        """
+        Computes the embeddings of the given text chunks.
+
+        Parameters:
+            text_chunks (list): A list of text chunks.
+            embedding (HuggingFaceEmbeddings): The embedding model.
+
+        Returns:
+            list: One vector per text chunk.
+
+        Raises:
+            Exception: If there is an error while embedding the chunks.
+        """
+        try:
+            self.logger.info("Embedding in progress...")
+            vectors = embedding.embed_documents([t.page_content for t in text_chunks])
+            self.logger.info("Embedding completed!")
+            return vectors
+
+        except Exception as e:
+            self.logger.error(msg=f"Error while embedding chunks: {str(e)}")
+
     # Download llm model from Huggingface Hub
     def download_model(self):
         """
@@ -117,7 +146,8 @@ class HelperFunctions:
             model = os.path.join(self.model_path, os.listdir(self.model_path)[0])
             llm = CTransformers(model=model,
                                 model_type="llama",
-                                config={"max_new_tokens": 512,
+                                config={"max_new_tokens": LLMConfigurations.MAX_NEW_TOKENS,
+                                        "context_length": LLMConfigurations.CONTEXT_LENGTH,
                                         "temperature": 0})
 
             self.logger.info("LLAMA2 Loaded!")
@@ -147,8 +177,27 @@ class HelperFunctions:
             self.logger.error(msg=f"Error while preparing prompt: {str(e)}")
 
 
+    def prepare_chat_prompt(self):
+        """
+        Prepares the prompt for chat sessions, which also carries the conversation history.
+
+        Returns:
+            PromptTemplate: The prepared prompt template.
+
+        Raises:
+            Exception: If there is an error while preparing the prompt.
+        """
+        try:
+            prompt = PromptTemplate(template=chat_prompt_template, input_variables=["history", "context", "question"])
+            self.logger.info(msg="Chat prompt created!")
+            return prompt
+
+        except Exception as e:
+            self.logger.error(msg=f"Error while preparing chat prompt: {str(e)}")
+
+
     # create qa chain for question answering chatbot
-    def qa_chain(self, prompt, llm, vector_store):
+    def qa_chain(self, prompt, llm, vector_store, reranker=None):
         """
         Initializes a RetrievalQA chain for question answering.
 
@@ -156,6 +205,7 @@ class HelperFunctions:
             prompt (str): The prompt to set in the chain type.
             llm (object): The language model to use for question answering.
             vector_store (object): The vector store to use for retrieval.
+            reranker (ReRanker, optional): Re-orders the top-N dense hits before the prompt is built. Defaults to None.
 
         Returns:
             RetrievalQA: The initialized RetrievalQA chain.
@@ -166,12 +216,22 @@ class HelperFunctions:
         try:
             # Set prompt into chain type
             chain_type_kwargs = {"prompt": prompt}
+
+            if reranker is None:
+                retriever = vector_store.as_retriever(search_kwargs={'k': 1})
+            else:
+                # Fetch top-N candidates and let the cross-encoder pick the best
+                retriever = ContextualCompressionRetriever(
+                    base_compressor=CrossEncoderCompressor(reranker=reranker),
+                    base_retriever=vector_store.as_retriever(
+                        search_kwargs={'k': ReRankerConfigurations.RERANK_TOP_N})
+                )
             
             # Initialise RetrievalQA for question answering
             qa = RetrievalQA.from_chain_type(
                 llm=llm,
                 chain_type="stuff",
-                retriever=vector_store.as_retriever(search_kwargs={'k': 1}),
+                retriever=retriever,
                 return_source_documents=False,
                 chain_type_kwargs=chain_type_kwargs
             )
@@ -205,3 +265,33 @@ class HelperFunctions:
 
         except Exception as e:
             self.logger.error(msg=f"Error while resolving query: {str(e)}")
+
+
+    # answer a chat turn from already retrieved chunks
+    def chat_result(self, prompt, llm, chunks, history, query):
+        """
+        Answers a chat turn with a "stuff" chain over the given chunks, so retrieval stays under
+        the control of the chat session.
+
+        Args:
+            prompt (PromptTemplate): The chat prompt.
+            llm (object): The language model to use for question answering.
+            chunks (list): The chunks to answer from.
+            history (str): The rendered conversation history.
+            query (str): The user's question.
+
+        Returns:
+            dict: The response containing the answer under "output_text".
+
+        Raises:
+            Exception: If there is an error while resolving the query.
+        """
+        try:
+            self.logger.info(msg="Searching answer...")
+            chain = load_qa_chain(llm=llm, chain_type="stuff", prompt=prompt)
+            response = chain({"input_documents": chunks, "history": history, "question": query})
+            self.logger.info(msg="Query resolved!")
+            return response
+
+        except Exception as e:
+            self.logger.error(msg=f"Error while resolving query: {str(e)}")
@@ -0,0 +1,250 @@
+from langchain.retrievers.document_compressors.base import BaseDocumentCompressor
+from collections import OrderedDict
+from hashlib import sha1
+from typing import Any, Optional, Sequence
+import time
+from logger.logger import Logger
+from config import ReRankerConfigurations
+
+
+class ReRanker:
+    def __init__(
+            self,
+            model_name=ReRankerConfigurations.RERANK_MODEL,
+            batch_size=ReRankerConfigurations.RERANK_BATCH_SIZE,
+            time_budget=ReRankerConfigurations.RERANK_TIME_BUDGET,
+            cache_size=ReRankerConfigurations.RERANK_CACHE_SIZE,
+            probe_interval=ReRankerConfigurations.RERANK_PROBE_INTERVAL
+            ) -> None:
+        """
+        Initializes the ReRanker object which re-orders dense retrieval hits with a local cross-encoder.
+
+        Args:
+            model_name (str, optional): The cross-encoder model to load. Defaults to ReRankerConfigurations.RERANK_MODEL.
+            batch_size (int, optional): Number of (query, chunk) pairs scored per forward pass.
+            time_budget (float, optional): Maximum seconds the stage may add to a query before it skips itself.
+            cache_size (int, optional): Maximum number of (query, chunk) scores kept in memory.
+            probe_interval (int, optional): Consecutive budget skips after which a single pair is scored to re-measure the model.
+
+        Returns:
+            None
+        """
+        self.logger = Logger("ReRanker")
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.time_budget = time_budget
+        self.cache_size = cache_size
+        self.probe_interval = probe_interval
+        self.model = None
+        self.load_failed = False
+
+        self.cache = OrderedDict()
+        self.seconds_per_pair = None
+        self.warmed_up = False
+        self.skips_since_probe = 0
+        self.load_seconds = 0.0
+
+        # counters reported through stats()
+        self.calls = 0
+        self.skipped = 0
+        self.top_changed = 0
+        self.total_latency = 0.0
+
+    # Load the cross-encoder lazily so that disabled re-ranking costs nothing
+    def load_model(self):
+        """
+        Loads the cross-encoder model if it has not been loaded yet. Loading time is recorded
+        separately from re-ranking latency.
+
+        Returns:
+            CrossEncoder: The loaded cross-encoder model.
+        """
+        if self.model is None:
+            # imported here so that sentence-transformers/torch are only loaded when re-ranking is used
+            from sentence_transformers import CrossEncoder
+
+            self.logger.info(msg=f"Loading cross-encoder {self.model_name}...")
+            started = time.perf_counter()
+            self.model = CrossEncoder(self.model_name, max_length=512)
+            self.load_seconds = time.perf_counter() - started
+            self.logger.info(msg=f"Cross-encoder loaded in {self.load_seconds:.1f} s!")
+        return self.model
+
+    @staticmethod
+    def _cache_key(query: str, text: str):
+        return query, sha1(text.encode("utf-8")).hexdigest()
+
+    def _remember(self, key, score: float):
+        self.cache[key] = score
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _update_pair_cost(self, seconds: float, pairs: int):
+        # exponential moving average of the per-pair scoring cost
+        cost = seconds / pairs
+        if self.seconds_per_pair is None:
+            self.seconds_per_pair = cost
+        else:
+            self.seconds_per_pair = 0.8 * self.seconds_per_pair + 0.2 * cost
+
+    def _predict(self, model, query, documents, batch, scores):
+        """
+        Scores one batch of pending (index, cache key) pairs, caching the scores.
+
+        Returns:
+            float: The seconds spent in the forward pass.
+        """
+        batch_started = time.perf_counter()
+        batch_scores = model.predict(
+            [(query, documents[i].page_content) for i, _ in batch],
+            batch_size=self.batch_size,
+            show_progress_bar=False)
+        seconds = time.perf_counter() - batch_started
+
+        for (i, key), score in zip(batch, batch_scores):
+            scores[i] = float(score)
+            self._remember(key, scores[i])
+        return seconds
+
+    def _score(self, query: str, documents: Sequence, started: float) -> Optional[list]:
+        """
+        Scores the documents against the query, serving cached pairs from memory and scoring the rest in batches.
+
+        Without an estimate of the per-pair cost, or after probe_interval consecutive skips, a single pair
+        is scored first and its cost replaces the estimate, so a slow model is only ever probed with one pair.
+
+        Returns:
+            list or None: One score per document, or None if the time budget ran out.
+        """
+        scores = [None] * len(documents)
+        pending = []
+        for i, doc in enumerate(documents):
+            key = self._cache_key(query, doc.page_content)
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                scores[i] = self.cache[key]
+            else:
+                pending.append((i, key))
+
+        if not pending:
+            return scores
+
+        probe = self.seconds_per_pair is None or self.skips_since_probe >= self.probe_interval
+
+        # Skip before doing any work when the estimate already exceeds the budget
+        if not probe and len(pending) * self.seconds_per_pair > self.time_budget:
+            self.skips_since_probe += 1
+            return None
+
+        model = self.load_model()
+        if probe:
+            # the first forward pass pays for warm-up and would skew the estimate
+            if not self.warmed_up:
+                self._predict(model, query, documents, pending[:1], scores)
+                self.warmed_up = True
+                pending = pending[1:]
+
+            if pending:
+                self.seconds_per_pair = self._predict(model, query, documents, pending[:1], scores)
+                pending = pending[1:]
+            self.skips_since_probe = 0
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            elapsed = time.perf_counter() - started
+            # the whole remainder has to fit, not just the next batch
+            if elapsed + (len(pending) - start) * self.seconds_per_pair > self.time_budget:
+                self.skips_since_probe += 1
+                return None
+
+            seconds = self._predict(model, query, documents, batch, scores)
+            self._update_pair_cost(seconds, len(batch))
+
+        return scores
+
+    # Re-order retrieved documents by cross-encoder relevance
+    def rerank(self, query, documents):
+        """
+        Re-orders the retrieved documents by cross-encoder score, falling back to the dense order
+        when the time budget would be exceeded or scoring fails.
+
+        Parameters:
+            query (str): The user's query.
+            documents (list): The documents returned by the vector store, best dense match first.
+
+        Returns:
+            list: The documents ordered from most to least relevant.
+        """
+        documents = list(documents)
+        if len(documents) < 2:
+            return documents
+
+        self.calls += 1
+        if self.load_failed:
+            self.skipped += 1
+            return documents
+
+        try:
+            # load outside the timed section so loading is not reported as re-ranking latency
+            self.load_model()
+
+        except Exception as e:
+            # do not retry on every query, e.g. when the model cannot be downloaded
+            self.load_failed = True
+            self.logger.error(msg=f"Error while loading cross-encoder, disabling re-ranking: {str(e)}")
+            self.skipped += 1
+            return documents
+
+        started = time.perf_counter()
+        try:
+            scores = self._score(query=query, documents=documents, started=started)
+
+        except Exception as e:
+            self.logger.error(msg=f"Error while re-ranking documents: {str(e)}")
+            scores = None
+
+        latency = time.perf_counter() - started
+        self.total_latency += latency
+
+        if scores is None:
+            self.skipped += 1
+            self.logger.info(msg=f"Re-ranking skipped after {latency * 1000:.1f} ms, keeping dense order.")
+            return documents
+
+        order = sorted(range(len(documents)), key=lambda i: scores[i], reverse=True)
+        if order[0] != 0:
+            self.top_changed += 1
+
+        self.logger.info(msg=f"Re-ranked {len(documents)} documents in {latency * 1000:.1f} ms.")
+        return [documents[i] for i in order]
+
+    def stats(self):
+        """
+        Reports the latency added by the re-rank stage and how often it changed the top result.
+
+        Returns:
+            dict: Call, skip and top-change counts, average added latency, model load time and cache size.
+        """
+        ranked = self.calls - self.skipped
+        return {
+            "calls": self.calls,
+            "skipped": self.skipped,
+            "top_changed": self.top_changed,
+            "top_change_rate": self.top_changed / ranked if ranked else 0.0,
+            "avg_latency_ms": 1000 * self.total_latency / self.calls if self.calls else 0.0,
+            "load_seconds": self.load_seconds,
+            "load_failed": self.load_failed,
+            "cached_pairs": len(self.cache),
+        }
+
+
+class CrossEncoderCompressor(BaseDocumentCompressor):
+    """
+    Adapts ReRanker to LangChain's ContextualCompressionRetriever, keeping the top_k re-ranked documents.
+    """
+    reranker: Any
+    top_k: int = ReRankerConfigurations.RERANK_TOP_K
+
+    def compress_documents(self, documents, query, callbacks=None):
+        return self.reranker.rerank(query=query, documents=documents)[:self.top_k]
@@ -0,0 +1,119 @@
+import json
+import os
+import time
+import numpy as np
+from langchain_core.documents import Document
+from src.artifacts import ArtifactStore, MANIFEST_FILE, CHUNKS_FILE
+from config import EmbeddingConfigurations
+
+
+def make_store(tmp_path, **kwargs):
+    return ArtifactStore(artifact_path=str(tmp_path), **kwargs)
+
+
+def save_bundle(store, doc_id, n_chunks=2, dimension=4):
+    documents = [Document(page_content="page", metadata={"source": "a.txt"})]
+    chunks = [Document(page_content=f"chunk {i}") for i in range(n_chunks)]
+    vectors = np.random.rand(n_chunks, dimension).tolist()
+    store.save(doc_id=doc_id, source_name="a.txt", documents=documents, text_chunks=chunks, vectors=vectors)
+    return chunks, vectors
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = make_store(tmp_path)
+    chunks, vectors = save_bundle(store, "doc")
+
+    bundle = store.load(doc_id="doc")
+
+    assert [c.page_content for c in bundle["chunks"]] == [c.page_content for c in chunks]
+    np.testing.assert_allclose(bundle["vectors"], vectors, rtol=1e-6)
+    assert bundle["manifest"]["embedding_model"] == EmbeddingConfigurations.EMBEDDING_MODEL
+    assert bundle["manifest"]["chunker_version"] == EmbeddingConfigurations.CHUNKER_VERSION
+    assert bundle["manifest"]["num_chunks"] == 2
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_load_missing_bundle(tmp_path):
+    assert make_store(tmp_path).load(doc_id="missing") is None
+
+
+def test_load_ignores_stale_chunker_version(tmp_path):
+    store = make_store(tmp_path)
+    save_bundle(store, "doc")
+    manifest_path = os.path.join(store.bundle_path("doc"), MANIFEST_FILE)
+    with open(manifest_path) as buffer:
+        manifest = json.load(buffer)
+    manifest["chunker_version"] = "recursive-1000-0"
+    with open(manifest_path, "w") as buffer:
+        json.dump(manifest, buffer)
+
+    assert store.load(doc_id="doc") is None
+
+
+def test_load_ignores_corrupted_bundle(tmp_path):
+    store = make_store(tmp_path)
+    save_bundle(store, "doc")
+    with open(os.path.join(store.bundle_path("doc"), CHUNKS_FILE), "w") as buffer:
+        json.dump([{"page_content": "only one", "metadata": {}}], buffer)
+
+    assert store.load(doc_id="doc") is None
+
+
+def test_load_recent_returns_most_recently_used_first(tmp_path):
+    store = make_store(tmp_path)
+    for doc_id in ("old", "new"):
+        save_bundle(store, doc_id)
+    age(os.path.join(store.bundle_path("old"), MANIFEST_FILE), 60)
+
+    bundles = store.load_recent(limit=1)
+
+    assert [b["manifest"]["doc_id"] for b in bundles] == ["new"]
+
+
+def test_garbage_collect_by_age(tmp_path):
+    store = make_store(tmp_path, max_age_days=1)
+    save_bundle(store, "old")
+    save_bundle(store, "new")
+    age(os.path.join(store.bundle_path("old"), MANIFEST_FILE), 2 * 24 * 60 * 60)
+
+    assert store.garbage_collect() == 1
+    assert sorted(os.listdir(tmp_path)) == ["new"]
+
+
+def test_garbage_collect_by_size_drops_oldest_and_keeps_current(tmp_path):
+    store = make_store(tmp_path)
+    for i, doc_id in enumerate(("a", "b", "c")):
+        save_bundle(store, doc_id, n_chunks=100, dimension=64)
+        age(os.path.join(store.bundle_path(doc_id), MANIFEST_FILE), 60 * (3 - i))
+    bundle_size = sum(entry.stat().st_size for entry in os.scandir(store.bundle_path("a")))
+
+    # room for two bundles; "a" is the oldest but is the one just saved
+    store.max_size_mb = 2.5 * bundle_size / (1024 * 1024)
+    store.garbage_collect(keep="a")
+
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+
+
+def test_garbage_collect_keeps_oversized_current_bundle(tmp_path):
+    store = make_store(tmp_path, max_size_mb=0)
+    save_bundle(store, "doc")
+
+    assert store.garbage_collect(keep="doc") == 0
+    assert os.listdir(tmp_path) == ["doc"]
+
+
+def test_garbage_collect_spares_writes_in_progress(tmp_path):
+    store = make_store(tmp_path, stale_write_seconds=60)
+    in_progress = tmp_path / "doc.abc.tmp"
+    abandoned = tmp_path / "doc.def.tmp"
+    in_progress.mkdir()
+    abandoned.mkdir()
+    age(abandoned, 120)
+
+    assert store.garbage_collect() == 1
+    assert os.listdir(tmp_path) == ["doc.abc.tmp"]
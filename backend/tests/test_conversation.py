@@ -0,0 +1,162 @@
+from langchain_core.documents import Document
+from src.conversation import ChatSession
+from src.prompt import chat_prompt_template
+
+
+class StubEmbedding:
+    """Maps each known question and chunk text to a fixed vector."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_query(self, text):
+        return self.vectors[text]
+
+    def embed_documents(self, texts):
+        return [self.vectors[t] for t in texts]
+
+
+class StubVectorStore:
+    """Returns the chunk registered for the query vector, or nothing."""
+
+    def __init__(self, chunks_by_vector):
+        self.chunks_by_vector = chunks_by_vector
+        self.calls = 0
+
+    def similarity_search_by_vector_with_score(self, embedding, k):
+        self.calls += 1
+        return [(Document(page_content=text), 0.9) for text in self.chunks_by_vector.get(tuple(embedding), [])]
+
+
+def ask(session, query, embedding, vector_store, answer="answer"):
+    chunks, calls = session.retrieve(query=query, embedding=embedding, vector_store=vector_store)
+    session.add_turn(query=query, answer=answer, retrieval_calls=calls)
+    return chunks
+
+
+EMBEDDING = StubEmbedding({
+    "what is x?": [1.0, 0.0, 0.0],
+    "x is a letter": [0.8, 0.6, 0.0],
+    # far from the first question (cosine 0.6) but close to the chunk it retrieved
+    "tell me more about that letter": [0.6, 0.8, 0.0],
+    "what is y?": [0.0, 0.0, 1.0],
+    "y is another letter": [0.0, 0.6, 0.8],
+})
+STORE_CHUNKS = {(1.0, 0.0, 0.0): ["x is a letter"], (0.0, 0.0, 1.0): ["y is another letter"]}
+
+
+def test_follow_up_close_to_chunks_reuses_them():
+    vector_store = StubVectorStore(STORE_CHUNKS)
+    session = ChatSession(reuse_ratio=0.9)
+
+    first = ask(session, "what is x?", EMBEDDING, vector_store)
+    second = ask(session, "tell me more about that letter", EMBEDDING, vector_store)
+
+    assert [c.page_content for c in second] == [c.page_content for c in first] == ["x is a letter"]
+    assert vector_store.calls == 1
+    assert session.stats()["retrieval_calls_per_turn"] == 0.5
+    assert session.stats()["reused"] == 1
+
+
+def test_unrelated_question_retrieves_again():
+    vector_store = StubVectorStore(STORE_CHUNKS)
+    session = ChatSession(reuse_ratio=0.9)
+
+    ask(session, "what is x?", EMBEDDING, vector_store)
+    chunks = ask(session, "what is y?", EMBEDDING, vector_store)
+
+    assert [c.page_content for c in chunks] == ["y is another letter"]
+    assert vector_store.calls == 2
+    assert session.stats()["reused"] == 0
+
+
+def test_only_recent_retrievals_are_reused():
+    embedding = StubEmbedding({"x": [1.0, 0.0, 0.0], "y": [0.0, 1.0, 0.0], "z": [0.0, 0.0, 1.0],
+                               "cx": [1.0, 0.0, 0.0], "cy": [0.0, 1.0, 0.0], "cz": [0.0, 0.0, 1.0]})
+    vector_store = StubVectorStore({(1.0, 0.0, 0.0): ["cx"], (0.0, 1.0, 0.0): ["cy"], (0.0, 0.0, 1.0): ["cz"]})
+    session = ChatSession(reuse_ratio=0.9, reuse_window=2)
+
+    for query in ("x", "y", "z", "x"):
+        ask(session, query, embedding, vector_store)
+
+    assert vector_store.calls == 4
+
+
+def test_empty_retrieval_is_not_reused():
+    vector_store = StubVectorStore({})
+    session = ChatSession(reuse_ratio=0.9)
+
+    ask(session, "what is x?", EMBEDDING, vector_store)
+    ask(session, "what is x?", EMBEDDING, vector_store)
+
+    assert vector_store.calls == 2
+    assert len(session.candidates) == 0
+
+
+def test_turns_keep_only_text_and_candidates_are_bounded():
+    vector_store = StubVectorStore(STORE_CHUNKS)
+    session = ChatSession(reuse_ratio=0.9, reuse_window=1)
+
+    for query in ("what is x?", "what is y?", "what is x?"):
+        ask(session, query, EMBEDDING, vector_store)
+
+    assert all(set(turn) == {"query", "answer", "retrieval_calls"} for turn in session.turns)
+    assert len(session.candidates) == 1
+
+
+def test_reranker_picks_chunks_on_retrieval():
+    class StubReRanker:
+        def rerank(self, query, documents):
+            return list(reversed(documents))
+
+    class ManyChunks(StubVectorStore):
+        def similarity_search_by_vector_with_score(self, embedding, k):
+            self.calls += 1
+            return [(Document(page_content=str(i)), 0.9) for i in range(k)]
+
+    embedding = StubEmbedding({"q": [1.0], **{str(i): [1.0] for i in range(10)}})
+    session = ChatSession()
+    chunks, calls = session.retrieve(query="q", embedding=embedding, vector_store=ManyChunks({}),
+                                     reranker=StubReRanker())
+
+    assert calls == 1
+    assert chunks[0].page_content != "0"
+
+
+def test_history_keeps_recent_turns_and_shortens_older_ones():
+    session = ChatSession()
+    for i in range(3):
+        session.add_turn(query=f"question {i}", answer="a" * 60, retrieval_calls=1)
+
+    full = session.count_tokens("User: question 2\nAssistant: " + "a" * 60)
+    short = session.count_tokens("User: question 1")
+    history = session.history(budget=full + short)
+
+    assert history == "User: question 1\nUser: question 2\nAssistant: " + "a" * 60
+
+
+def test_history_is_empty_without_budget():
+    session = ChatSession()
+    session.add_turn(query="q", answer="a", retrieval_calls=1)
+
+    assert session.history(budget=0) == ""
+
+
+def test_history_budget_keeps_prompt_within_context():
+    session = ChatSession(token_budget=10_000, context_length=2048, max_new_tokens=512)
+    chunks = [Document(page_content="c" * 500)]
+    for i in range(50):
+        session.add_turn(query=f"question {i}", answer="a" * 300, retrieval_calls=1)
+
+    budget = session.history_budget(query="q", chunks=chunks)
+    prompt = chat_prompt_template.format(history=session.history(budget=budget), context=chunks[0].page_content,
+                                         question="q")
+
+    assert session.count_tokens(prompt) + session.max_new_tokens <= session.context_length
+
+
+def test_history_budget_is_capped_and_never_negative():
+    session = ChatSession(token_budget=100, context_length=2048, max_new_tokens=512)
+
+    assert session.history_budget(query="q", chunks=[]) == 100
+    assert session.history_budget(query="q", chunks=[Document(page_content="c" * 10_000)]) == 0
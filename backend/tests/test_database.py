@@ -0,0 +1,102 @@
+import types
+import numpy as np
+from langchain_core.documents import Document
+from database import ChatbotDB
+
+
+class FakeIndex:
+    def __init__(self):
+        self.vectors = {}
+        self.deleted = False
+
+    def describe_index_stats(self):
+        return {"total_vector_count": len(self.vectors)}
+
+    def delete(self, deleteAll=False):
+        self.deleted = True
+        self.vectors.clear()
+
+    def fetch(self, ids):
+        return types.SimpleNamespace(vectors={i: self.vectors[i] for i in ids if i in self.vectors})
+
+    def upsert(self, vectors):
+        for vector in vectors:
+            self.vectors[vector["id"]] = vector
+
+
+class FakeClient:
+    def __init__(self, index):
+        self.index = index
+
+    def list_indexes(self):
+        return types.SimpleNamespace(names=lambda: ["docubot"])
+
+    def describe_index(self, name):
+        return types.SimpleNamespace(status={"ready": True})
+
+    def Index(self, name):
+        return self.index
+
+
+def make_db(index):
+    db = ChatbotDB(api_key="key", environment="env", index="docubot")
+    db.client = FakeClient(index)
+    return db
+
+
+def make_bundle(doc_id, n_chunks):
+    return {
+        "manifest": {"doc_id": doc_id},
+        "chunks": [Document(page_content=f"chunk {i}") for i in range(n_chunks)],
+        "vectors": np.ones((n_chunks, 4), dtype=np.float32),
+    }
+
+
+def test_connect_without_clear_keeps_data():
+    index = FakeIndex()
+    index.vectors["doc-0"] = {}
+
+    make_db(index).connect(clear=False)
+
+    assert not index.deleted
+    assert "doc-0" in index.vectors
+
+
+def test_connect_clears_by_default():
+    index = FakeIndex()
+    index.vectors["doc-0"] = {}
+
+    make_db(index).connect()
+
+    assert index.deleted
+
+
+def test_attach_bundles_upserts_only_missing_vectors():
+    index = FakeIndex()
+    index.vectors["doc-0"] = {"id": "doc-0", "marker": "kept"}
+    upserted = []
+    original_upsert = index.upsert
+
+    def recording_upsert(vectors):
+        upserted.extend(v["id"] for v in vectors)
+        original_upsert(vectors)
+
+    index.upsert = recording_upsert
+
+    assert make_db(index).attach_bundles(bundles=[make_bundle("doc", 3)])
+    assert upserted == ["doc-1", "doc-2"]
+    assert index.vectors["doc-0"]["marker"] == "kept"
+    assert index.vectors["doc-2"]["metadata"] == {"text": "chunk 2"}
+
+
+def test_attach_bundles_skips_vectors_already_stored():
+    index = FakeIndex()
+    db = make_db(index)
+    db.attach_bundles(bundles=[make_bundle("doc", 2)])
+
+    def failing_upsert(vectors):
+        raise AssertionError("nothing should be upserted")
+
+    index.upsert = failing_upsert
+
+    assert db.attach_bundles(bundles=[make_bundle("doc", 2)])
@@ -0,0 +1,85 @@
+import io
+import os
+import tracemalloc
+from hashlib import sha256
+from src.document_loader import DocumentHandler
+
+
+class Upload(io.BytesIO):
+    """Mimics Streamlit's UploadedFile, which is a BytesIO over the uploaded bytes."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def make_handler(tmp_path, chunk_size=None):
+    handler = DocumentHandler()
+    handler.document_path = str(tmp_path)
+    if chunk_size is not None:
+        handler.write_chunk_size = chunk_size
+    return handler
+
+
+def test_save_streams_content_and_hash(tmp_path):
+    data = os.urandom(10_000)
+    handler = make_handler(tmp_path, chunk_size=1024)
+
+    file_path, digest = handler.save(file=Upload(data, "report.txt"))
+
+    with open(file_path, "rb") as buffer:
+        assert buffer.read() == data
+    assert digest == sha256(data).hexdigest()
+
+
+def test_save_keeps_names_with_several_dots(tmp_path):
+    file_path, _ = make_handler(tmp_path).save(file=Upload(b"x", "annual.report.v2.pdf"))
+
+    name = os.path.basename(file_path)
+    assert name.startswith("annual.report.v2-")
+    assert name.endswith(".pdf")
+
+
+def test_save_accepts_plain_file_objects(tmp_path):
+    data = os.urandom(5000)
+    source = tmp_path / "source.bin"
+    source.write_bytes(data)
+    handler = make_handler(tmp_path / "out", chunk_size=512)
+
+    class Named(io.FileIO):
+        name = "source.bin"
+
+    with Named(str(source)) as file:
+        file_path, digest = handler.save(file=file)
+
+    with open(file_path, "rb") as buffer:
+        assert buffer.read() == data
+    assert digest == sha256(data).hexdigest()
+
+
+def test_save_peak_memory_is_one_chunk(tmp_path):
+    """
+    Guards against copying the upload while saving, e.g. through BytesIO.getbuffer(), which unshares
+    the buffer. Baseline getvalue() passed this too; the chunked write only keeps it bounded for any input.
+    """
+    # keep a reference to the bytes, as Streamlit does, so the BytesIO buffer is shared
+    data = b"\0" * (64 * 1024 * 1024)
+    upload = Upload(data, "large.txt")
+    handler = make_handler(tmp_path)
+
+    tracemalloc.start()
+    handler.save(file=upload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # a full copy of the upload would be 64 MB
+    assert peak < 2 * handler.write_chunk_size
+
+
+def test_load_matches_extension_case_insensitively(tmp_path):
+    path = tmp_path / "notes.final.TXT"
+    path.write_text("hello")
+
+    documents = make_handler(tmp_path).load(file_path=str(path))
+
+    assert documents[0].page_content == "hello"
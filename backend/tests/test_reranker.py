@@ -0,0 +1,147 @@
+import time
+from langchain_core.documents import Document
+from src.reranker import ReRanker, CrossEncoderCompressor
+
+
+class StubCrossEncoder:
+    """Scores a pair by the length of the chunk and sleeps `delay` seconds per pair."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.pairs_scored = 0
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        time.sleep(self.delay * len(pairs))
+        self.pairs_scored += len(pairs)
+        return [float(len(text)) for _, text in pairs]
+
+
+def make_reranker(model, **kwargs):
+    reranker = ReRanker(**kwargs)
+    reranker.model = model
+    return reranker
+
+
+def docs(*texts):
+    return [Document(page_content=t) for t in texts]
+
+
+def test_rerank_orders_by_score_and_counts_top_change():
+    reranker = make_reranker(StubCrossEncoder(), time_budget=10)
+
+    ranked = reranker.rerank(query="q", documents=docs("a", "ccc", "bb"))
+
+    assert [d.page_content for d in ranked] == ["ccc", "bb", "a"]
+    assert reranker.stats()["top_changed"] == 1
+
+
+def test_scores_are_cached_per_query_and_chunk():
+    model = StubCrossEncoder()
+    reranker = make_reranker(model, time_budget=10)
+
+    reranker.rerank(query="q", documents=docs("a", "bb"))
+    reranker.rerank(query="q", documents=docs("a", "bb"))
+    assert model.pairs_scored == 2
+
+    reranker.rerank(query="other", documents=docs("a", "bb"))
+    assert model.pairs_scored == 4
+
+
+def test_cache_evicts_least_recently_used():
+    reranker = make_reranker(StubCrossEncoder(), time_budget=10, cache_size=2)
+
+    reranker.rerank(query="q", documents=docs("a", "bb"))
+    reranker.rerank(query="q", documents=docs("bb", "ccc"))
+
+    assert len(reranker.cache) == 2
+    assert ReRanker._cache_key("q", "a") not in reranker.cache
+
+
+def test_skips_when_estimate_exceeds_budget():
+    reranker = make_reranker(StubCrossEncoder(), time_budget=0.01)
+    reranker.warmed_up = True
+    reranker.seconds_per_pair = 1.0
+
+    documents = docs("a", "ccc")
+    assert reranker.rerank(query="q", documents=documents) == documents
+    assert reranker.stats()["skipped"] == 1
+    assert reranker.model.pairs_scored == 0
+
+
+def test_recovers_after_slow_warm_up():
+    model = StubCrossEncoder(delay=0.01)
+    reranker = make_reranker(model, time_budget=0.02)
+    documents = docs(*("x" * n for n in range(1, 9)))
+
+    # cold warm-up and one more slow call push the estimate over the budget
+    reranker.rerank(query="q0", documents=documents)
+    reranker.rerank(query="q1", documents=documents)
+    assert reranker.seconds_per_pair * len(documents) > reranker.time_budget
+
+    model.delay = 0.0
+    skipped_before = reranker.skipped
+    for i in range(2, 7):
+        reranker.rerank(query=f"q{i}", documents=documents)
+
+    assert reranker.skipped - skipped_before < 5
+    assert reranker.seconds_per_pair * len(documents) <= reranker.time_budget
+
+
+def test_estimate_comes_from_probe_not_warm_up():
+    reranker = make_reranker(StubCrossEncoder(), time_budget=10)
+
+    class FastAfterWarmUp(StubCrossEncoder):
+        def predict(self, pairs, batch_size=32, show_progress_bar=False):
+            scores = super().predict(pairs, batch_size, show_progress_bar)
+            self.delay = 0.0
+            return scores
+
+    reranker.model = FastAfterWarmUp(delay=0.05)
+    reranker.rerank(query="q", documents=docs("a", "bb", "ccc"))
+
+    assert reranker.seconds_per_pair < 0.01
+
+
+def test_slow_model_stays_within_budget():
+    probe_interval = 5
+    model = StubCrossEncoder(delay=0.005)
+    reranker = make_reranker(model, time_budget=0.02, probe_interval=probe_interval)
+    documents = docs(*("x" * n for n in range(1, 9)))  # 8 pairs take 40 ms, twice the budget
+
+    calls, over_budget = 20, 0
+    for i in range(calls):
+        started = time.perf_counter()
+        ranked = reranker.rerank(query=f"q{i}", documents=documents)
+        if time.perf_counter() - started > reranker.time_budget:
+            over_budget += 1
+        assert ranked == documents  # never an ordering that blew the budget
+
+    assert over_budget <= calls // probe_interval
+    assert reranker.stats()["skipped"] == calls
+
+
+def test_failed_load_is_not_retried():
+    reranker = ReRanker()
+    attempts = []
+
+    def failing_load():
+        attempts.append(1)
+        raise OSError("offline")
+
+    reranker.load_model = failing_load
+    documents = docs("a", "ccc")
+
+    for _ in range(3):
+        assert reranker.rerank(query="q", documents=documents) == documents
+
+    assert len(attempts) == 1
+    assert reranker.stats()["load_failed"]
+
+
+def test_compressor_keeps_top_k():
+    reranker = make_reranker(StubCrossEncoder(), time_budget=10)
+    compressor = CrossEncoderCompressor(reranker=reranker, top_k=2)
+
+    kept = compressor.compress_documents(documents=docs("a", "ccc", "bb"), query="q")
+
+    assert [d.page_content for d in kept] == ["ccc", "bb"]